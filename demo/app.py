@@ -33,6 +33,13 @@ def get_mapper() -> TaxonomyMapper:
     return TaxonomyMapper(taxonomy)
 
 
+@st.cache_data(show_spinner=False)
+def _cached_map(tags_tuple: tuple, snippet: str):
+    # Mapping is deterministic, so identical (tags, snippet) inputs can be
+    # served from Streamlit's data cache across reruns.
+    return get_mapper().map(case_id=0, user_tags=list(tags_tuple), snippet=snippet)
+
+
 st.set_page_config(page_title="Adaptive Taxonomy Mapper Demo", layout="centered")
 
 st.title("Adaptive Taxonomy Mapper Demo")
@@ -58,8 +65,7 @@ with col2:
 
 if run:
     tags: List[str] = [t.strip() for t in (tags_csv or "").split(",") if t.strip()]
-    mapper = get_mapper()
-    res = mapper.map(case_id=0, user_tags=tags, snippet=snippet or "")
+    res = _cached_map(tuple(tags), snippet or "")
 
     st.subheader("Result")
     st.metric("Mapped Leaf", res.mapped)
@@ -10,13 +10,18 @@ Usage:
 from __future__ import annotations
 
 import json
+import multiprocessing
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-from src.mapper import TaxonomyMapper
+from src.mapper import MappingResult, TaxonomyMapper
 
 ROOT = os.path.dirname(os.path.abspath(__file__))
 
+# Per-worker mapper, built once by the pool initializer so each worker loads
+# the taxonomy a single time instead of once per case.
+_MAPPER: Optional[TaxonomyMapper] = None
+
 def load_json(path: str) -> Any:
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
@@ -24,6 +29,25 @@ def load_json(path: str) -> Any:
 def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
+def _init_worker(taxonomy: Dict[str, Any]) -> None:
+    global _MAPPER
+    _MAPPER = TaxonomyMapper(taxonomy)
+
+def _result_dict(res: MappingResult) -> Dict[str, Any]:
+    return {
+        "id": res.case_id,
+        "user_tags": res.user_tags,
+        "snippet": res.snippet,
+        "mapped": res.mapped,
+        "path": res.path,
+        "confidence": round(res.confidence, 4),
+        "reasoning": res.reasoning,
+        "top_scores": res.scores,
+    }
+
+def _map_case(case: Dict[str, Any]) -> Dict[str, Any]:
+    return _result_dict(_MAPPER.map(case_id=case["id"], user_tags=case["user_tags"], snippet=case["snippet"]))
+
 def main() -> None:
     taxonomy_path = os.path.join(ROOT, "data", "taxonomy.json")
     testcases_path = os.path.join(ROOT, "data", "test_cases.json")
@@ -33,33 +57,37 @@ def main() -> None:
     taxonomy: Dict[str, Any] = load_json(taxonomy_path)
     test_cases: List[Dict[str, Any]] = load_json(testcases_path)
 
-    mapper = TaxonomyMapper(taxonomy)
+    try:  # Optional: enables the batched matrix-scoring path below.
+        import numpy
+    except ImportError:
+        numpy = None
+
+    if numpy is not None:
+        # Batched path: one (cases x phrases) hit matrix multiplied by the
+        # precomputed weight matrices scores the whole Golden Set at once.
+        mapper = TaxonomyMapper(taxonomy)
+        results = [_result_dict(res) for res in mapper.map_batch(test_cases)]
+    else:
+        # Cases are independent, so shard them across a worker pool. pool.map
+        # preserves input order; printing happens after collection so stdout
+        # stays coherent.
+        processes = os.cpu_count() or 1
+        chunksize = max(1, len(test_cases) // (4 * processes))
+        with multiprocessing.Pool(processes=processes, initializer=_init_worker, initargs=(taxonomy,)) as pool:
+            results = pool.map(_map_case, test_cases, chunksize=chunksize)
 
-    results = []
     print("\n=== Adaptive Taxonomy Mapper: Results (Readable) ===\n")
-    for case in test_cases:
-        res = mapper.map(case_id=case["id"], user_tags=case["user_tags"], snippet=case["snippet"])
-        results.append({
-            "id": res.case_id,
-            "user_tags": res.user_tags,
-            "snippet": res.snippet,
-            "mapped": res.mapped,
-            "path": res.path,
-            "confidence": round(res.confidence, 4),
-            "reasoning": res.reasoning,
-            "top_scores": res.scores,
-        })
-
-        print(f"Case {res.case_id}")
-        print(f"  Tags      : {res.user_tags}")
-        print(f"  Snippet   : {res.snippet}")
-        print(f"  Mapped    : {res.mapped}")
-        if res.path:
-            print(f"  Path      : {res.path}")
-        print(f"  Confidence: {res.confidence:.2f}")
-        if res.scores:
-            print(f"  TopScores : {res.scores}")
-        print(f"  Reasoning : {res.reasoning}")
+    for res in results:
+        print(f"Case {res['id']}")
+        print(f"  Tags      : {res['user_tags']}")
+        print(f"  Snippet   : {res['snippet']}")
+        print(f"  Mapped    : {res['mapped']}")
+        if res["path"]:
+            print(f"  Path      : {res['path']}")
+        print(f"  Confidence: {res['confidence']:.2f}")
+        if res["top_scores"]:
+            print(f"  TopScores : {res['top_scores']}")
+        print(f"  Reasoning : {res['reasoning']}")
         print("-" * 70)
 
     out_path = os.path.join(out_dir, "results.json")
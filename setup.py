@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Optional build script for the compiled scoring kernel.
+
+  python setup.py build_ext --inplace
+
+Cython is only needed to build the extension; the mapper runs fine on the
+pure-Python kernel without it.
+"""
+from setuptools import Extension, setup
+
+try:
+    from Cython.Build import cythonize
+    ext_modules = cythonize(
+        [Extension("src._score", ["src/_score.pyx"])],
+        language_level=3,
+    )
+except ImportError:
+    ext_modules = []
+
+setup(
+    name="adaptive-taxonomy-mapper",
+    version="0.1.0",
+    packages=["src"],
+    ext_modules=ext_modules,
+)
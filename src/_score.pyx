@@ -0,0 +1,38 @@
+# cython: language_level=3
+"""
+Compiled scoring kernel (Cython twin of _score_py.score_all).
+
+Build with `python setup.py build_ext --inplace`; mapper.py falls back to
+the pure-Python version when this extension is absent.
+"""
+
+
+def score_all(
+    object snip_phrases,
+    object tags_phrases,
+    object snip_tokens,
+    object tags_tokens,
+    dict phrase_index,
+    dict token_index,
+    dict weights,
+):
+    """Tally matched phrase counts/tokens into per-leaf scores via the reverse index."""
+    cdef dict scores = {}
+    cdef double weak_weight
+    cdef long count
+    cdef str source, phrase, leaf, cue_class
+
+    for source, phrases, tokens in (
+        ("snippet", snip_phrases, snip_tokens),
+        ("tags", tags_phrases, tags_tokens),
+    ):
+        for phrase, count in phrases.items():
+            for leaf, cue_class in phrase_index[phrase]:
+                scores[leaf] = scores.get(leaf, 0.0) + count * <double> weights[(source, cue_class)]
+
+        weak_weight = <double> weights[(source, "weak")]
+        for token in tokens:
+            for leaf in token_index.get(token, ()):
+                scores[leaf] = scores.get(leaf, 0.0) + weak_weight
+
+    return scores
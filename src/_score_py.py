@@ -0,0 +1,37 @@
+"""
+Pure-Python scoring kernel.
+
+A compiled twin lives in _score.pyx; build it with
+`python setup.py build_ext --inplace` and mapper.py will prefer it.
+Both implementations must stay behaviorally identical.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+
+def score_all(
+    snip_phrases: Dict[str, int],
+    tags_phrases: Dict[str, int],
+    snip_tokens: frozenset,
+    tags_tokens: frozenset,
+    phrase_index: Dict[str, List[Tuple[str, str]]],
+    token_index: Dict[str, List[str]],
+    weights: Dict[Tuple[str, str], float],
+) -> Dict[str, float]:
+    """Tally matched phrase counts/tokens into per-leaf scores via the reverse index."""
+    scores: Dict[str, float] = {}
+    for source, phrases, tokens in (
+        ("snippet", snip_phrases, snip_tokens),
+        ("tags", tags_phrases, tags_tokens),
+    ):
+        for phrase, count in phrases.items():
+            for leaf, cue_class in phrase_index[phrase]:
+                scores[leaf] = scores.get(leaf, 0.0) + count * weights[(source, cue_class)]
+
+        weak_weight = weights[(source, "weak")]
+        for token in tokens:
+            for leaf in token_index.get(token, ()):
+                scores[leaf] = scores.get(leaf, 0.0) + weak_weight
+
+    return scores
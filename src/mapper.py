@@ -8,11 +8,44 @@ Implements the three rules:
 """
 from __future__ import annotations
 
+import hashlib
+import heapq
+import json
+import os
+import pickle
 import re
+import sys
+from collections import Counter
+from operator import itemgetter
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 
-_WORD_RE = re.compile(r"[a-z0-9']+")
+def _import_ahocorasick():
+    """Optional: Aho-Corasick multi-pattern matching (pip install pyahocorasick).
+
+    Imported lazily so plain CLI startup does not pay for the extension;
+    sys.modules makes repeat calls free.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+    return ahocorasick
+
+
+try:  # Optional: DFA-backed regex engine, no backtracking (pip install google-re2)
+    import re2 as _re_engine
+except ImportError:
+    _re_engine = re
+
+try:  # Optional: compiled scoring kernel (python setup.py build_ext --inplace)
+    from ._score import score_all as _score_kernel
+except ImportError:
+    from ._score_py import score_all as _score_kernel
+
+# All patterns here are literal alternations or simple character classes, so
+# they compile identically under re and re2.
+_WORD_RE = _re_engine.compile(r"[a-z0-9']+")
 
 def normalize_text(s: str) -> str:
     return s.strip().lower()
@@ -24,17 +57,28 @@ def contains_any(text: str, phrases: List[str]) -> bool:
     t = normalize_text(text)
     return any(p in t for p in phrases)
 
-def flatten_taxonomy(taxonomy: Dict[str, Dict[str, List[str]]]) -> Dict[str, Tuple[str, str, str]]:
+def flatten_taxonomy(
+    taxonomy: Dict[str, Dict[str, List[str]]],
+) -> Tuple[List[str], List[str], List[str], Dict[str, int]]:
     """
-    Returns: leaf_label -> (top, mid, leaf)
-    Example: "Cyberpunk" -> ("Fiction", "Sci-Fi", "Cyberpunk")
+    Flattens the taxonomy into structure-of-arrays parallel lists.
+
+    Returns: (names, tops, mids, index) where names[i] is a leaf living under
+    tops[i] / mids[i], and index maps leaf name -> position i.
+    Example: names[index["Cyberpunk"]] sits under "Fiction" / "Sci-Fi".
     """
-    leaves: Dict[str, Tuple[str, str, str]] = {}
-    for top, mids in taxonomy.items():
-        for mid, leaf_list in mids.items():
+    names: List[str] = []
+    tops: List[str] = []
+    mids: List[str] = []
+    index: Dict[str, int] = {}
+    for top, mid_map in taxonomy.items():
+        for mid, leaf_list in mid_map.items():
             for leaf in leaf_list:
-                leaves[leaf] = (top, mid, leaf)
-    return leaves
+                index[leaf] = len(names)
+                names.append(leaf)
+                tops.append(top)
+                mids.append(mid)
+    return names, tops, mids, index
 
 
 # Transparent lexicon for scoring (can be expanded).
@@ -106,8 +150,54 @@ NONFICTION_SIGNALS = {
     ]
 }
 
+# Frozen views of the signal lists, built once at import: membership tests and
+# intersections against token sets are single C-level calls.
+_NF_INSTRUCTIONAL = frozenset(NONFICTION_SIGNALS["instructional"])
+_NF_WORDS = frozenset(NONFICTION_SIGNALS["nonfiction_words"])
+
+
+def _build_lexicon_index() -> Tuple[Dict[str, List[Tuple[str, str]]], Dict[str, List[str]]]:
+    """
+    Invert LEXICON once at import: phrase -> [(leaf, "strong"|"weak"), ...]
+    and weak word -> [leaf, ...]. Shared cues like "love" or "romance" get one
+    interned canonical string and one entry list, so a single scan credits
+    every leaf that cares. LEXICON itself stays in its readable per-leaf form.
+    """
+    phrase_index: Dict[str, List[Tuple[str, str]]] = {}
+    token_index: Dict[str, List[str]] = {}
+    for leaf, cues in LEXICON.items():
+        for cue_class in ("strong", "weak"):
+            for phrase in cues[cue_class]:
+                phrase_index.setdefault(sys.intern(phrase), []).append((leaf, cue_class))
+        for word in cues["weak"]:
+            token_index.setdefault(sys.intern(word), []).append(leaf)
+    return phrase_index, token_index
+
+
+_PHRASE_INDEX, _TOKEN_INDEX = _build_lexicon_index()
+
+
+# Weight table for phrase/token hits, keyed on (source, cue class).
+# Snippet matches > tag matches (Context Wins); strong cues > weak cues.
+SCORE_WEIGHTS: Dict[Tuple[str, str], float] = {
+    ("snippet", "strong"): 4.0,
+    ("snippet", "weak"): 1.5,
+    ("tags", "strong"): 1.5,
+    ("tags", "weak"): 0.5,
+}
+
+
+@dataclass(slots=True, frozen=True)
+class _Prep:
+    """Normalized/tokenized views of one case's inputs, computed once per map()."""
+    snip_lc: str
+    tags_lc: str
+    combined_lc: str
+    snip_tokens: frozenset
+    tags_tokens: frozenset
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MappingResult:
     case_id: int
     user_tags: List[str]
@@ -120,69 +210,213 @@ class MappingResult:
 
 
 class TaxonomyMapper:
-    def __init__(self, taxonomy: Dict[str, Any]):
+    # Bump when the shape of the cached derived state changes.
+    _CACHE_VERSION = 1
+    _CACHED_ATTRS = (
+        "_phrase_to_entries",
+        "_token_to_leaves",
+        "_nf_instr_re",
+        "_scorable_leaves",
+        "_alt_re",
+        "_ac",
+    )
+
+    def __init__(self, taxonomy: Dict[str, Any], use_cache: bool = True):
         self.taxonomy = taxonomy
-        self.leaves = flatten_taxonomy(taxonomy)
-        self.allowed_leaf_set = set(self.leaves.keys())
+        self._leaf_names, self._leaf_tops, self._leaf_mids, self._leaf_index = flatten_taxonomy(taxonomy)
+        self.allowed_leaf_set = set(self._leaf_names)
+
+        # Weight matrices for map_batch, built lazily on first use (numpy is
+        # an optional dependency).
+        self._batch_mats = None
+
+        # The derived matching state (regexes, indexes, automaton) is the
+        # expensive part of init, so cold starts — Streamlit restarts, pool
+        # workers — try to load it from an on-disk cache first.
+        cache_path = self._cache_path(taxonomy) if use_cache else None
+        if cache_path is not None and self._load_state(cache_path):
+            return
+
+        self._build_state()
+
+        if cache_path is not None:
+            self._save_state(cache_path)
+
+    def _cache_path(self, taxonomy: Dict[str, Any]) -> Optional[str]:
+        """Cache file keyed by taxonomy, lexicon and available backends."""
+        try:
+            key_src = json.dumps(
+                (
+                    self._CACHE_VERSION,
+                    taxonomy,
+                    LEXICON,
+                    NONFICTION_SIGNALS,
+                    _re_engine.__name__,
+                    _import_ahocorasick() is not None,
+                ),
+                sort_keys=True,
+            )
+        except (TypeError, ValueError):
+            return None
+        digest = hashlib.sha1(key_src.encode("utf-8")).hexdigest()
+        return os.path.join(os.path.expanduser("~"), ".cache", "atm", f"{digest}.pkl")
+
+    def _load_state(self, cache_path: str) -> bool:
+        try:
+            with open(cache_path, "rb") as f:
+                state = pickle.load(f)
+        except Exception:
+            return False
+        if set(state) != set(self._CACHED_ATTRS):
+            return False
+        for attr, value in state.items():
+            setattr(self, attr, value)
+        return True
+
+    def _save_state(self, cache_path: str) -> None:
+        state = {attr: getattr(self, attr) for attr in self._CACHED_ATTRS}
+        tmp_path = f"{cache_path}.tmp.{os.getpid()}"
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)  # atomic, safe across pool workers
+        except Exception:
+            # Caching is best-effort; some backends (e.g. re2 patterns) may
+            # not pickle, and a cold build is always correct.
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def _build_state(self) -> None:
+        # Instance view of the import-time inverted index, restricted to the
+        # leaves that exist in this taxonomy. All phrases are folded into one
+        # alternation regex so each input text is scanned once instead of once
+        # per leaf per phrase.
+        self._phrase_to_entries: Dict[str, List[Tuple[str, str]]] = {}
+        self._token_to_leaves: Dict[str, List[str]] = {}
+        for phrase, entries in _PHRASE_INDEX.items():
+            kept = [(leaf, cue_class) for leaf, cue_class in entries if leaf in self.allowed_leaf_set]
+            if kept:
+                self._phrase_to_entries[phrase] = kept
+        for word, leaves in _TOKEN_INDEX.items():
+            kept_leaves = [leaf for leaf in leaves if leaf in self.allowed_leaf_set]
+            if kept_leaves:
+                self._token_to_leaves[word] = kept_leaves
+
+        # Non-fiction gate: one compiled alternation for the instructional
+        # phrases (single C-level scan per text).
+        self._nf_instr_re = _re_engine.compile(
+            "|".join(map(re.escape, sorted(_NF_INSTRUCTIONAL)))
+        )
 
-    def _is_nonfiction(self, snippet: str, tags: List[str]) -> Tuple[bool, str]:
-        s = normalize_text(snippet)
-        t = normalize_text(" ".join(tags))
+        # Only leaves with lexicon entries can ever score; everything else
+        # would always come back 0.0, so skip it in the per-case loop.
+        self._scorable_leaves: Tuple[str, ...] = tuple(
+            leaf for leaf in LEXICON if leaf in self.allowed_leaf_set
+        )
 
-        if contains_any(s, NONFICTION_SIGNALS["instructional"]) or contains_any(t, NONFICTION_SIGNALS["instructional"]):
-            return True, (
-                "Snippet/tags contain instructional/recipe-like phrasing (e.g., 'how to', 'mix', 'bake'), "
-                "which is not covered by the Fiction taxonomy."
+        # Longest phrases first so e.g. "slow burn" wins over a shorter prefix.
+        self._alt_re: Optional[Any] = None
+        if self._phrase_to_entries:
+            self._alt_re = _re_engine.compile(
+                "|".join(sorted(map(re.escape, self._phrase_to_entries), key=len, reverse=True))
             )
 
-        toks = set(tokenize(s + " " + t))
-        if any(w in toks for w in NONFICTION_SIGNALS["nonfiction_words"]):
+        # When pyahocorasick is installed, build one automaton over all
+        # phrases so a text is scanned with a single linear-time DFA walk
+        # instead of the regex alternation. The payload carries the phrase
+        # plus its (leaf, cue class) entries from the reverse index.
+        self._ac = None
+        ahocorasick = _import_ahocorasick()
+        if ahocorasick is not None and self._phrase_to_entries:
+            self._ac = ahocorasick.Automaton()
+            for phrase, entries in self._phrase_to_entries.items():
+                self._ac.add_word(phrase, (phrase, tuple(entries)))
+            self._ac.make_automaton()
+
+    def _is_nonfiction(self, prep: _Prep) -> Tuple[bool, str]:
+        # Cheapest predicate first: the token intersection is one C-level set
+        # op, so it gates the (costlier) instructional-phrase scan.
+        toks = prep.snip_tokens | prep.tags_tokens
+        if toks & _NF_WORDS:
             return True, (
                 "Snippet/tags contain strong non-fiction/recipe indicators (e.g., flour/sugar/bake/telescope), "
                 "so we should not force-fit into Fiction genres."
             )
 
+        if self._nf_instr_re.search(prep.combined_lc):
+            return True, (
+                "Snippet/tags contain instructional/recipe-like phrasing (e.g., 'how to', 'mix', 'bake'), "
+                "which is not covered by the Fiction taxonomy."
+            )
+
         return False, ""
 
-    def _score_leaf(self, leaf: str, tags_text: str, snippet_text: str) -> float:
-        """
-        Weighted scoring:
-        - Snippet matches > Tag matches (Context Wins).
-        - Strong phrase cues > weak cues.
+    def _matched_phrases(self, text: str) -> Dict[str, int]:
         """
-        if leaf not in LEXICON:
-            return 0.0
-
-        strong = LEXICON[leaf]["strong"]
-        weak = LEXICON[leaf]["weak"]
+        Occurrence counts of lexicon phrases in `text` (already normalized).
+        A cue that appears three times is a stronger signal than one that
+        appears once, so every occurrence counts.
 
-        def phrase_hits(text: str, phrases: List[str]) -> int:
-            t = normalize_text(text)
-            return sum(1 for p in phrases if p in t)
-
-        def token_hits(text: str, words: List[str]) -> int:
-            toks = set(tokenize(text))
-            return sum(1 for w in words if w in toks)
-
-        snippet_strong = phrase_hits(snippet_text, strong)
-        tags_strong = phrase_hits(tags_text, strong)
+        Both backends use longest-match semantics: iter_long emits maximal
+        non-overlapping hits, mirroring the longest-first alternation regex,
+        so a phrase nested inside a longer one is not double-counted.
+        """
+        if self._ac is not None:
+            return Counter(payload[0] for _, payload in self._ac.iter_long(text))
+        if self._alt_re is None:
+            return {}
+        return Counter(self._alt_re.findall(text))
 
-        snippet_weak = phrase_hits(snippet_text, weak) + token_hits(snippet_text, weak)
-        tags_weak = phrase_hits(tags_text, weak) + token_hits(tags_text, weak)
+    def _score_all(self, prep: _Prep) -> Dict[str, float]:
+        """
+        Weighted scoring for every lexicon leaf at once:
+        - Snippet matches > Tag matches (Context Wins).
+        - Strong phrase cues > weak cues.
 
-        score = (
-            4.0 * snippet_strong +
-            1.5 * snippet_weak +
-            1.5 * tags_strong +
-            0.5 * tags_weak
+        Inputs are already normalized/tokenized by the caller (once per case),
+        so each text is scanned exactly once; hits are tallied into per-leaf
+        scores by the scoring kernel (compiled when the _score extension is
+        built, pure Python otherwise).
+        """
+        if not self._phrase_to_entries:
+            return {}
+
+        return _score_kernel(
+            self._matched_phrases(prep.snip_lc),
+            self._matched_phrases(prep.tags_lc),
+            prep.snip_tokens,
+            prep.tags_tokens,
+            self._phrase_to_entries,
+            self._token_to_leaves,
+            SCORE_WEIGHTS,
         )
-        return float(score)
 
-    def map(self, case_id: int, user_tags: List[str], snippet: str) -> MappingResult:
+    def map(
+        self,
+        case_id: int,
+        user_tags: List[str],
+        snippet: str,
+        scores: Optional[Dict[str, float]] = None,
+    ) -> MappingResult:
         tags_text = " ".join(user_tags)
         snippet_text = snippet
 
-        nf, nf_reason = self._is_nonfiction(snippet_text, user_tags)
+        # Normalize and tokenize each text once per case; the nonfiction gate,
+        # scoring and reasoning checks all reuse these.
+        snip_lc = normalize_text(snippet_text)
+        tags_lc = normalize_text(tags_text)
+        prep = _Prep(
+            snip_lc=snip_lc,
+            tags_lc=tags_lc,
+            combined_lc=snip_lc + " " + tags_lc,
+            snip_tokens=frozenset(_WORD_RE.findall(snip_lc)),
+            tags_tokens=frozenset(_WORD_RE.findall(tags_lc)),
+        )
+
+        nf, nf_reason = self._is_nonfiction(prep)
         if nf:
             return MappingResult(
                 case_id=case_id,
@@ -195,12 +429,14 @@ class TaxonomyMapper:
                 reasoning=nf_reason + " => Output [UNMAPPED]."
             )
 
-        scores: Dict[str, float] = {}
-        for leaf in sorted(self.allowed_leaf_set):
-            scores[leaf] = self._score_leaf(leaf, tags_text, snippet_text)
+        if scores is None:
+            scores = {leaf: 0.0 for leaf in self._scorable_leaves}
+            scores.update(self._score_all(prep))
 
-        ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
-        best_leaf, best_score = ranked[0]
+        # Only the top-2 (confidence) and top-5 (display) are ever used, so a
+        # bounded heap selection beats sorting every leaf.
+        ranked = heapq.nlargest(5, scores.items(), key=itemgetter(1))
+        best_leaf, best_score = ranked[0] if ranked else ("", 0.0)
         second_leaf, second_score = ranked[1] if len(ranked) > 1 else ("", 0.0)
 
         separation = best_score - second_score
@@ -214,18 +450,18 @@ class TaxonomyMapper:
                 mapped="[UNMAPPED]",
                 path=None,
                 confidence=confidence,
-                scores=dict(ranked[:5]),
+                scores=dict(ranked),
                 reasoning=(
                     "No strong matches to any existing taxonomy leaf; best score is too low to map responsibly. "
                     "Honesty Rule => Output [UNMAPPED]."
                 )
             )
 
-        top, mid, leaf = self.leaves[best_leaf]
-        path = [top, mid, leaf]
+        i = self._leaf_index[best_leaf]
+        path = [self._leaf_tops[i], self._leaf_mids[i], best_leaf]
 
-        snippet_low = normalize_text(snippet)
-        tags_low = normalize_text(" ".join(user_tags))
+        snippet_low = prep.snip_lc
+        tags_low = prep.tags_lc
         reasoning_parts = [
             f"Top match: '{best_leaf}' (score={best_score:.1f}); runner-up: '{second_leaf}' (score={second_score:.1f}).",
         ]
@@ -251,6 +487,92 @@ class TaxonomyMapper:
             mapped=best_leaf,
             path=path,
             confidence=confidence,
-            scores=dict(ranked[:5]),
+            scores=dict(ranked),
             reasoning=" ".join(reasoning_parts)
         )
+
+    def _build_batch_mats(self, np):
+        """(num_phrases x num_leaves) / (num_tokens x num_leaves) weight matrices."""
+        leaf_col = {leaf: j for j, leaf in enumerate(self._scorable_leaves)}
+        phrases = sorted(self._phrase_to_entries)
+        tokens = sorted(self._token_to_leaves)
+
+        w_strong = np.zeros((len(phrases), len(leaf_col)), dtype=np.float32)
+        w_weak = np.zeros((len(phrases), len(leaf_col)), dtype=np.float32)
+        for i, phrase in enumerate(phrases):
+            for leaf, cue_class in self._phrase_to_entries[phrase]:
+                if cue_class == "strong":
+                    w_strong[i, leaf_col[leaf]] = 1.0
+                else:
+                    w_weak[i, leaf_col[leaf]] = 1.0
+
+        t_weak = np.zeros((len(tokens), len(leaf_col)), dtype=np.float32)
+        for i, token in enumerate(tokens):
+            for leaf in self._token_to_leaves[token]:
+                t_weak[i, leaf_col[leaf]] = 1.0
+
+        phrase_col = {p: i for i, p in enumerate(phrases)}
+        token_col = {t: i for i, t in enumerate(tokens)}
+        return phrase_col, token_col, w_strong, w_weak, t_weak
+
+    def map_batch(self, cases: List[Dict[str, Any]]) -> List[MappingResult]:
+        """
+        Map a whole list of cases at once, computing every score in a single
+        matrix product (hit matrix @ weight matrix) instead of per-case,
+        per-leaf Python loops. Requires numpy; callers should fall back to
+        per-case map() when it is unavailable.
+
+        Each case dict needs "id", "user_tags" and "snippet" keys, matching
+        data/test_cases.json.
+        """
+        import numpy as np
+
+        if self._batch_mats is None:
+            self._batch_mats = self._build_batch_mats(np)
+        phrase_col, token_col, w_strong, w_weak, t_weak = self._batch_mats
+
+        n = len(cases)
+        h_snip = np.zeros((n, len(phrase_col)), dtype=np.float32)
+        h_tags = np.zeros((n, len(phrase_col)), dtype=np.float32)
+        t_snip = np.zeros((n, len(token_col)), dtype=np.float32)
+        t_tags = np.zeros((n, len(token_col)), dtype=np.float32)
+
+        for i, case in enumerate(cases):
+            snip_lc = normalize_text(case["snippet"])
+            tags_lc = normalize_text(" ".join(case["user_tags"]))
+            for phrase, count in self._matched_phrases(snip_lc).items():
+                h_snip[i, phrase_col[phrase]] = count
+            for phrase, count in self._matched_phrases(tags_lc).items():
+                h_tags[i, phrase_col[phrase]] = count
+            for token in set(_WORD_RE.findall(snip_lc)):
+                col = token_col.get(token)
+                if col is not None:
+                    t_snip[i, col] = 1.0
+            for token in set(_WORD_RE.findall(tags_lc)):
+                col = token_col.get(token)
+                if col is not None:
+                    t_tags[i, col] = 1.0
+
+        score_mat = (
+            SCORE_WEIGHTS[("snippet", "strong")] * (h_snip @ w_strong)
+            + SCORE_WEIGHTS[("snippet", "weak")] * (h_snip @ w_weak)
+            + SCORE_WEIGHTS[("tags", "strong")] * (h_tags @ w_strong)
+            + SCORE_WEIGHTS[("tags", "weak")] * (h_tags @ w_weak)
+            + SCORE_WEIGHTS[("snippet", "weak")] * (t_snip @ t_weak)
+            + SCORE_WEIGHTS[("tags", "weak")] * (t_tags @ t_weak)
+        )
+
+        results: List[MappingResult] = []
+        for i, case in enumerate(cases):
+            case_scores = {
+                leaf: float(score_mat[i, j]) for j, leaf in enumerate(self._scorable_leaves)
+            }
+            results.append(
+                self.map(
+                    case_id=case["id"],
+                    user_tags=case["user_tags"],
+                    snippet=case["snippet"],
+                    scores=case_scores,
+                )
+            )
+        return results